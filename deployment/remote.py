@@ -1,13 +1,12 @@
+import argparse
+import functools
 import os
 import sys
 import logging
 
 import vertexai
-from absl import app, flags
 from dotenv import load_dotenv
 from vertexai import agent_engines
-from vertexai.preview import reasoning_engines
-from repeat.agent import root_agent
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -25,52 +24,59 @@ stream_handler.setFormatter(formatter)
 logger.addHandler(file_handler)
 logger.addHandler(stream_handler)
 
-# Define flags for command-line arguments (keep this section only once)
-FLAGS = flags.FLAGS
-flags.DEFINE_string("project_id", None, "GCP project ID.")
-flags.DEFINE_string("location", None, "GCP location.")
-flags.DEFINE_string("bucket", None, "GCP bucket.")
-flags.DEFINE_string("resource_id", None, "ReasoningEngine resource ID (for delete, get_session, send).")
-flags.DEFINE_string("user_id", "test_user", "User ID for session operations.")
-flags.DEFINE_string("session_id", None, "Session ID for operations (for get_session, send).")
-flags.DEFINE_bool("create", False, "Creates a new deployment.")
-flags.DEFINE_bool("delete", False, "Deletes an existing deployment.")
-flags.DEFINE_bool("list", False, "Lists all deployments.")
-flags.DEFINE_bool("create_session", False, "Creates a new session.")
-flags.DEFINE_bool("list_sessions", False, "Lists all sessions for a user.")
-flags.DEFINE_bool("get_session", False, "Gets a specific session.")
-flags.DEFINE_bool("send", False, "Sends a message to the deployed agent.")
-flags.DEFINE_string(
-    "message",
-    "Hello, what can you do?", # Default message
-    "Message to send to the agent.",
+# Define command-line arguments (keep this section only once)
+parser = argparse.ArgumentParser(description="Manage Agent Engine deployments and sessions.")
+parser.add_argument("--project_id", default=None, help="GCP project ID.")
+parser.add_argument("--location", default=None, help="GCP location.")
+parser.add_argument("--bucket", default=None, help="GCP bucket.")
+parser.add_argument("--resource_id", default=None, help="ReasoningEngine resource ID (for delete, get_session, send).")
+parser.add_argument("--user_id", default="test_user", help="User ID for session operations.")
+parser.add_argument("--session_id", default=None, help="Session ID for operations (for get_session, send). If omitted with --send, a new session is created.")
+parser.add_argument(
+    "--message",
+    default="Hello, what can you do?", # Default message
+    help="Message to send to the agent.",
 )
 # Flags for Firebase Secret Manager
-flags.DEFINE_string("firebase_secret_id", None, "Secret Manager Secret ID for Firebase credentials.")
-flags.DEFINE_string("firebase_secret_version", None, "Secret Manager Secret Version for Firebase credentials.")
+parser.add_argument("--firebase_secret_id", default=None, help="Secret Manager Secret ID for Firebase credentials.")
+parser.add_argument("--firebase_secret_version", default=None, help="Secret Manager Secret Version for Firebase credentials.")
 
 # Ensure only one action flag is set
-flags.mark_bool_flags_as_mutual_exclusive(
-    [
-        "create",
-        "delete",
-        "list",
-        "create_session",
-        "list_sessions",
-        "get_session",
-        "send",
-    ]
-)
-
+actions = parser.add_mutually_exclusive_group()
+actions.add_argument("--create", action="store_true", help="Creates a new deployment.")
+actions.add_argument("--delete", action="store_true", help="Deletes an existing deployment.")
+actions.add_argument("--list", action="store_true", help="Lists all deployments.")
+actions.add_argument("--create_session", action="store_true", help="Creates a new session.")
+actions.add_argument("--list_sessions", action="store_true", help="Lists all sessions for a user.")
+actions.add_argument("--get_session", action="store_true", help="Gets a specific session.")
+actions.add_argument("--send", action="store_true", help="Sends a message to the deployed agent.")
+actions.add_argument("--interactive", action="store_true", help="Reads actions from stdin, one per line, reusing the initialized client.")
+
+
+@functools.lru_cache(maxsize=32)
+def _get_remote_app(resource_name: str):
+    """Fetches a deployed app, reusing the handle for repeated lookups."""
+    return agent_engines.get(resource_name)
+
+
+def create(project_id: str) -> str | None:
+    """Creates a new deployment and returns its resource name."""
+    # Only deployment needs the agent and AdkApp, so import them here to keep
+    # start-up of the other actions cheap
+    try:
+        from vertexai.preview import reasoning_engines
+    except ImportError as e:
+        logger.error(f"Error importing vertexai.preview.reasoning_engines: {e}")
+        logger.error("Please ensure google-cloud-aiplatform[adk,agent_engines] is installed.")
+        return None
 
-def create() -> None:
-    """Creates a new deployment."""
     try:
+        from repeat.agent import root_agent
         logger.info("Successfully imported root_agent.")
     except ImportError as e:
         logger.error(f"Error importing root_agent: {e}")
         logger.error("Please ensure your 'repeat' directory is structured correctly and contains agent.py.")
-        return
+        return None
 
     app = reasoning_engines.AdkApp(
         agent=root_agent,
@@ -98,15 +104,18 @@ def create() -> None:
 
     logger.info(f"AgentEngine deployment created: {remote_app.resource_name}")
     print(f"AgentEngine deployment created: {remote_app.resource_name}")
-    print(f"View progress and logs at https://console.cloud.google.com/logs/query?project={FLAGS.project_id}&resource=aiplatform.googleapis.com%2FreasoningEngine%2F{remote_app.resource_name.split('/')[-1]}")
+    print(f"View progress and logs at https://console.cloud.google.com/logs/query?project={project_id}&resource=aiplatform.googleapis.com%2FreasoningEngine%2F{remote_app.resource_name.split('/')[-1]}")
+    return remote_app.resource_name
 
 
 def delete(resource_name: str) -> None:
     """Deletes an existing deployment."""
     try:
         logger.info(f"Deleting remote app: {resource_name}")
-        remote_app = agent_engines.get(resource_name)
+        remote_app = _get_remote_app(resource_name)
         remote_app.delete(force=True)
+        # Drop the cached handle so later lookups don't return a deleted app
+        _get_remote_app.cache_clear()
         print(f"Deleted remote app: {resource_name}")
     except Exception as e:
         logger.error(f"Error deleting remote app {resource_name}: {e}")
@@ -117,13 +126,13 @@ def list_deployments() -> None:
     """Lists all deployments."""
     try:
         logger.info("Listing deployments...")
-        deployments = agent_engines.list()
-        if not deployments:
+        # resource_name comes from the list response, so no per-item fetch is needed
+        names = [deployment.resource_name for deployment in agent_engines.list()]
+        if not names:
             print("No deployments found.")
             return
         print("Deployments:")
-        for deployment in deployments:
-            print(f"- {deployment.resource_name}")
+        print("\n".join(f"- {name}" for name in names))
     except Exception as e:
         logger.error(f"Error listing deployments: {e}")
         print(f"Error listing deployments: {e}")
@@ -133,7 +142,7 @@ def create_session(resource_name: str, user_id: str) -> None:
     """Creates a new session for the specified user."""
     try:
         logger.info(f"Creating session for deployment: {resource_name}")
-        remote_app = agent_engines.get(resource_name)
+        remote_app = _get_remote_app(resource_name)
         remote_session = remote_app.create_session(user_id=user_id)
         # Access session details using dictionary keys
         print("Created session:")
@@ -141,7 +150,7 @@ def create_session(resource_name: str, user_id: str) -> None:
         print(f"  User ID: {remote_session.get('user_id')}")
         print(f"  App name: {remote_session.get('app_name')}")
         print(f"  Last update time: {remote_session.get('last_update_time')}")
-        print("\nUse this session ID with --session_id when sending messages.")
+        print("\nUse this session ID when sending messages.")
     except Exception as e:
         logger.error(f"Error creating session for {resource_name}: {e}")
         print(f"Error creating session for {resource_name}: {e}")
@@ -151,7 +160,7 @@ def list_sessions(resource_name: str, user_id: str) -> None:
     """Lists all sessions for the specified user."""
     try:
         logger.info(f"Listing sessions for user '{user_id}' on deployment: {resource_name}")
-        remote_app = agent_engines.get(resource_name)
+        remote_app = _get_remote_app(resource_name)
         sessions = remote_app.list_sessions(user_id=user_id)
         print(f"Sessions for user '{user_id}':")
         if sessions:
@@ -168,7 +177,7 @@ def get_session(resource_name: str, user_id: str, session_id: str) -> None:
     """Gets a specific session."""
     try:
         logger.info(f"Getting session {session_id} for user '{user_id}' on deployment: {resource_name}")
-        remote_app = agent_engines.get(resource_name)
+        remote_app = _get_remote_app(resource_name)
         session = remote_app.get_session(user_id=user_id, session_id=session_id)
         print("Session details:")
         print(f"  ID: {session.get('id')}")
@@ -180,13 +189,18 @@ def get_session(resource_name: str, user_id: str, session_id: str) -> None:
         print(f"Error getting session {session_id} for {resource_name}: {e}")
 
 
-def send_message(resource_name: str, user_id: str, session_id: str, message: str) -> None:
-    """Sends a message to the deployed agent."""
+def send_message(resource_name: str, user_id: str, session_id: str | None, message: str) -> None:
+    """Sends a message to the deployed agent, creating a session if none is given."""
     try:
+        if not session_id:
+            # Create the session in the same process so the deployment lookup is reused
+            logger.info(f"Creating session for user '{user_id}' on deployment: {resource_name}")
+            session_id = _get_remote_app(resource_name).create_session(user_id=user_id).get('id')
+            print(f"Created session: {session_id}")
         logger.info(f"Sending message to session {session_id} on deployment: {resource_name}")
         print(f"Sending message to session {session_id} on deployment: {resource_name}")
         print(f"Message: {message}")
-        remote_app = agent_engines.get(resource_name)
+        remote_app = _get_remote_app(resource_name)
 
         print("\nResponse (streaming):")
         # Ensure you handle the event structure from stream_query based on your agent's output
@@ -214,23 +228,91 @@ def send_message(resource_name: str, user_id: str, session_id: str, message: str
         print(f"An error occurred while sending message to {resource_name}: {e}")
 
 
+def cmd_loop(project_id: str, resource_name: str | None, user_id: str) -> None:
+    """Runs actions read from stdin so one process serves many commands.
+
+    Each line is one of: list, create, delete, create_session, list_sessions,
+    get_session <session_id>, send [--session_id=<session_id>] <message>, or
+    quit. send without a session ID creates a new session, like --send does.
+    A successful create makes the new deployment the active resource for
+    the following commands.
+    """
+    print("Interactive mode. Enter one action per line, or 'quit' to exit.")
+    for line in sys.stdin:
+        # Split off only the command so message text is passed through verbatim
+        parts = line.strip().split(maxsplit=1)
+        if not parts:
+            continue
+        command = parts[0]
+        rest = parts[1] if len(parts) > 1 else ""
+        if command in ("quit", "exit"):
+            return
+        try:
+            if command == "list":
+                list_deployments()
+                continue
+            if command == "create":
+                created = create(project_id)
+                if created:
+                    resource_name = created
+                    print(f"Active deployment is now: {resource_name}")
+                continue
+            if not resource_name:
+                print(f"Error: resource_id is required for {command}. Provide --resource_id.")
+                continue
+            if command == "delete":
+                delete(resource_name)
+            elif command == "create_session":
+                create_session(resource_name, user_id)
+            elif command == "list_sessions":
+                list_sessions(resource_name, user_id)
+            elif command == "get_session" and len(rest.split()) == 1:
+                get_session(resource_name, user_id, rest)
+            elif command == "send" and rest:
+                session_id = None
+                if rest.startswith("--session_id="):
+                    session_arg, _, rest = rest.partition(" ")
+                    session_id = session_arg.removeprefix("--session_id=")
+                    rest = rest.strip()
+                if not rest:
+                    print("Error: send requires a message.")
+                    continue
+                send_message(resource_name, user_id, session_id, rest)
+            else:
+                print(f"Error: unknown or incomplete command: {line.strip()}")
+        except Exception as e:
+            logger.error(f"Error running interactive command '{command}': {e}")
+            print(f"Error running interactive command '{command}': {e}")
+
+
+def _resolve_log_level(value: str | None) -> int:
+    """Maps a LOG_LEVEL value (name or number) to a logging level, defaulting to INFO."""
+    if not value:
+        return logging.INFO
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    if isinstance(level, int):
+        return level
+    logger.warning(f"Unknown LOG_LEVEL '{value}', falling back to INFO.")
+    return logging.INFO
+
+
 def main(argv=None):
-    """Main function that can be called directly or through app.run()."""
-    # Parse flags first
-    if argv is None:
-        argv = flags.FLAGS(sys.argv)
-    else:
-        argv = flags.FLAGS(argv)
+    """Main function that can be called directly or as a script."""
+    args = parser.parse_args(argv)
 
     # Load environment variables from .env file
     load_dotenv()
+    logger.setLevel(_resolve_log_level(os.getenv("LOG_LEVEL")))
 
-    # Access the flags or environment variables
-    project_id = FLAGS.project_id if FLAGS.project_id else os.getenv("GOOGLE_CLOUD_PROJECT")
-    location = FLAGS.location if FLAGS.location else os.getenv("GOOGLE_CLOUD_LOCATION")
-    bucket = FLAGS.bucket if FLAGS.bucket else os.getenv("GOOGLE_CLOUD_STAGING_BUCKET")
-    user_id = FLAGS.user_id
-    resource_name = FLAGS.resource_id # Use resource_name for consistency
+    # Access the arguments or environment variables
+    project_id = args.project_id if args.project_id else os.getenv("GOOGLE_CLOUD_PROJECT")
+    location = args.location if args.location else os.getenv("GOOGLE_CLOUD_LOCATION")
+    bucket = args.bucket if args.bucket else os.getenv("GOOGLE_CLOUD_STAGING_BUCKET")
+    user_id = args.user_id
+    resource_name = args.resource_id # Use resource_name for consistency
 
     # Validate required configuration
     if not project_id:
@@ -261,56 +343,53 @@ def main(argv=None):
     print("Vertex AI initialized.")
 
     # Execute the requested action
-    if FLAGS.create:
-        create()
-    elif FLAGS.delete:
+    if args.create:
+        create(project_id)
+    elif args.delete:
         if not resource_name:
             logger.error("Error: resource_id is required for delete. Provide --resource_id.")
             print("Error: resource_id is required for delete. Provide --resource_id.")
             return
         delete(resource_name)
-    elif FLAGS.list:
+    elif args.list:
         list_deployments()
-    elif FLAGS.create_session:
+    elif args.create_session:
         if not resource_name:
             logger.error("Error: resource_id is required for create_session. Provide --resource_id.")
             print("Error: resource_id is required for create_session. Provide --resource_id.")
             return
         create_session(resource_name, user_id)
-    elif FLAGS.list_sessions:
+    elif args.list_sessions:
         if not resource_name:
             logger.error("Error: resource_id is required for list_sessions. Provide --resource_id.")
             print("Error: resource_id is required for list_sessions. Provide --resource_id.")
             return
         list_sessions(resource_name, user_id)
-    elif FLAGS.get_session:
+    elif args.get_session:
         if not resource_name:
             logger.error("Error: resource_id is required for get_session. Provide --resource_id.")
             print("Error: resource_id is required for get_session. Provide --resource_id.")
             return
-        if not FLAGS.session_id:
+        if not args.session_id:
             logger.error("Error: session_id is required for get_session. Provide --session_id.")
             print("Error: session_id is required for get_session. Provide --session_id.")
             return
-        get_session(resource_name, user_id, FLAGS.session_id)
-    elif FLAGS.send:
+        get_session(resource_name, user_id, args.session_id)
+    elif args.send:
         if not resource_name:
             logger.error("Error: resource_id is required for send. Provide --resource_id.")
             print("Error: resource_id is required for send. Provide --resource_id.")
             return
-        if not FLAGS.session_id:
-            logger.error("Error: session_id is required for send. Provide --session_id.")
-            print("Error: session_id is required for send. Provide --session_id.")
-            return
-        send_message(resource_name, user_id, FLAGS.session_id, FLAGS.message)
+        send_message(resource_name, user_id, args.session_id, args.message)
+    elif args.interactive:
+        cmd_loop(project_id, resource_name, user_id)
     else:
         print(
-            "Please specify one of the action flags: --create, --delete, --list, --create_session, --list_sessions, --get_session, or --send"
+            "Please specify one of the action flags: --create, --delete, --list, --create_session, --list_sessions, --get_session, --send, or --interactive"
         )
         print("\nExample for creation:")
         print("  poetry run python deployment/remote.py --create --project_id=<your-project-id> --location=<your-location> --bucket=<your-bucket-name> --firebase_secret_id=<your-secret-id>")
 
 
 if __name__ == "__main__":
-    # app.run() handles parsing flags and calling main
-    app.run(main)
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -1,16 +1,17 @@
-from vertexai import agent_engines
-import vertexai
 import asyncio # Import asyncio for running async code
 
-# Initialize Vertex AI
 PROJECT_ID = "image-gen-34b6b"
 LOCATION = "us-central1"
-vertexai.init(project=PROJECT_ID, location=LOCATION)
 
 # Load Agent Engine
 AGENT_ENGINE_RESOURCE_NAME = "projects/948832582788/locations/us-central1/reasoningEngines/7816041133766606848"
 
 async def main():
+    # Import and initialize Vertex AI only when run, so importing this module stays cheap
+    import vertexai
+    from vertexai import agent_engines
+    vertexai.init(project=PROJECT_ID, location=LOCATION)
+
     try:
         print(f"Loading Agent Engine: {AGENT_ENGINE_RESOURCE_NAME}")
         agent_engine = agent_engines.get(AGENT_ENGINE_RESOURCE_NAME) # Use await here